@@ -0,0 +1,75 @@
+"""
+Geometry cache
+
+Persist the artifacts derived from an EZG geometry, like the clip
+window on the RADOLAN grid or the selected DWD stations, across runs.
+Entries are keyed by a hash of everything they are derived from, thus
+a changed geometry, CRS or grid results in a new key.
+
+"""
+import os
+import pickle
+import hashlib
+import tempfile
+from typing import Any
+
+
+# bump this, whenever the layout of the cached artifacts changes
+CACHE_VERSION = 1
+
+
+class GeometryCache:
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._entries = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """
+        Build a cache key from the given parts. Bytes are hashed as
+        they are, everything else by its string representation.
+        """
+        h = hashlib.sha256(f'v{CACHE_VERSION}'.encode())
+        for part in parts:
+            h.update(part if isinstance(part, bytes) else str(part).encode())
+            h.update(b'|')
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # entries are only loaded from disk once requested
+        if key not in self._entries:
+            if not os.path.exists(self._path(key)):
+                return default
+            try:
+                with open(self._path(key), 'rb') as f:
+                    self._entries[key] = pickle.load(f)
+            except Exception as e:
+                print(f"Skipping broken cache entry {key}\n{str(e)}")
+                return default
+        
+        return self._entries[key]
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+
+        # write to a temporary file first to never leave half-written entries
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            f = os.fdopen(fd, 'wb')
+        except Exception:
+            os.close(fd)
+            os.remove(tmp)
+            raise
+        
+        try:
+            with f:
+                pickle.dump(value, f)
+            os.replace(tmp, self._path(key))
+        except Exception:
+            os.remove(tmp)
+            raise
@@ -5,8 +5,10 @@ Used to derive a bbox from each EZG, and clip downloaded data.
 
 """
 from typing import Callable, Tuple, Union, List
+from datetime import datetime as dt
 import fiona
-from rasterio.mask import mask
+from rasterio.features import geometry_mask
+from rasterio.windows import Window
 from pyproj import CRS, Transformer
 from shapely.geometry import shape, Polygon
 from shapely.ops import transform
@@ -15,6 +17,7 @@ from dateutil.parser import parse
 import numpy as np
 
 from .radolan import RadolanUtility
+from .cache import GeometryCache
 
 
 class EZG:
@@ -139,6 +142,37 @@ class EZG:
         stations = self._get_dwd_request()
         return stations.filter_by_rank(longitude=centroid.x, latitude=centroid.y, rank=n)
 
+    def get_dwd_stations(self, distance=None, n=1, cache: GeometryCache = None):
+        """
+        Select the DWD stations within the EZG. If there are none, fall back
+        to the stations around the centroid and finally to the n closest.
+        The selected station ids are persisted in the cache, if given. As
+        the DWD station inventory changes, they are re-selected each month.
+        """
+        # check for cached station ids of this request
+        if cache is not None:
+            params = sorted((k, str(v)) for k, v in self._dwd_request_params.items())
+            key = GeometryCache.key(self.WKB, self.crs.to_wkt(), 'stations', params, distance, n, dt.now().strftime('%Y-%m'))
+            station_ids = cache.get(key)
+            if station_ids:
+                stations = self._get_dwd_request().filter_by_station_id(station_ids)
+
+                # cached stations might have dropped out of the inventory
+                if not stations.df.empty:
+                    return stations
+
+        # select the stations
+        stations = self.get_dwd_within_ezg()
+        if stations.df.empty and distance is not None:
+            stations = self.get_dwd_around_centroid(distance, 'km')
+        if stations.df.empty:
+            stations = self.get_dwd_by_rank(n)
+
+        if cache is not None and not stations.df.empty:
+            cache.set(key, stations.df.station_id.tolist())
+
+        return stations
+
     def dwd_station_data(self, distance=None, n=None, **kwargs):
         """
         """
@@ -157,17 +191,52 @@ class EZG:
         # get the station data
         return [result.df.dropna() for result in stationResult.values.query() if not result.df.dropna().empty]
 
-    def dwd_radolan_load(self, util: RadolanUtility = None):
+    def dwd_radolan_load(self, util: RadolanUtility = None, cache: GeometryCache = None):
         if util is None:
             util = RadolanUtility()
 
         # this takes time
         datasets = util.datasets
         metadata = util.attributes
-        
+
+        # get the grid cells covered by this EZG
+        clip = self.radolan_clip(datasets[0], cache=cache)
+        row_off, col_off, height, width = clip['window']
+        window = Window(col_off, row_off, width, height)
+
+        # mask all cells of the window outside of the EZG
+        outside = np.ones((height, width), dtype=bool)
+        outside[clip['rows'] - row_off, clip['cols'] - col_off] = False
+
+        result = []
+        for dataset, meta in zip(datasets, metadata):
+            cropped = dataset.read(1, window=window)
+            maskeddata = np.ma.masked_equal(cropped, meta.get('nodataflag', -9999))
+            maskeddata[outside] = np.ma.masked
+            result.append(maskeddata)
+
+        return result
+
+    def radolan_clip(self, dataset, cache: GeometryCache = None) -> dict:
+        """
+        Derive the clip window and the indices of all grid cells of the
+        dataset grid covered by this EZG. A cell is covered, if its center
+        is inside the EZG. If that applies to no cell, as for very small
+        EZGs, all touched cells are used. Other than rasterio.mask, which
+        returned a fully masked chunk, such EZGs therefore get values.
+        The result is persisted in the cache, if given.
+        """
+        # the grid definition is part of the key
+        grid = (dataset.crs.to_wkt(), tuple(dataset.transform), dataset.width, dataset.height)
+        if cache is not None:
+            key = GeometryCache.key(self.WKB, self.crs.to_wkt(), 'radolan', *grid)
+            clip = cache.get(key)
+            if clip is not None:
+                return clip
+
         # create a transformer to meet Radolan CRS
         src_crs = self.crs
-        tgt_crs = datasets[0].crs
+        tgt_crs = dataset.crs
         transformer = Transformer.from_crs(src_crs, tgt_crs, always_xy=True).transform
         
         # transform the shape
@@ -176,13 +245,30 @@ class EZG:
         # get rid of the 3rd coordinate dimension as rasterio <= 1.3 can't handle that
         shape = transform(lambda x, y, z=None: (x, y), shape)
 
-        result = []
-        for dataset, meta in zip(datasets, metadata):
-            cropped, _ = mask(dataset, shapes=[shape], crop=True)
-            maskeddata = np.ma.masked_equal(cropped[0], meta.get('nodataflag', -9999))
-            result.append(maskeddata)
+        # check that the shape overlaps the raster at all
+        left, bottom, right, top = dataset.bounds
+        minx, miny, maxx, maxy = shape.bounds
+        if minx >= right or maxx <= left or miny >= top or maxy <= bottom:
+            raise ValueError('Input shapes do not overlap raster.')
 
-        return result
+        # rasterize the shape - cells are inside, if their center is
+        outside = geometry_mask([shape], out_shape=(dataset.height, dataset.width), transform=dataset.transform)
+        if outside.all():
+            outside = geometry_mask([shape], out_shape=(dataset.height, dataset.width), transform=dataset.transform, all_touched=True)
+        rows, cols = np.nonzero(~outside)
+        if rows.size == 0:
+            raise ValueError('Input shapes do not overlap raster.')
+        
+        clip = dict(
+            window=(int(rows.min()), int(cols.min()), int(rows.max() - rows.min() + 1), int(cols.max() - cols.min() + 1)),
+            rows=rows,
+            cols=cols,
+        )
+
+        if cache is not None:
+            cache.set(key, clip)
+        
+        return clip
 
     def __getitem__(self, key: str) -> Union[str, float, int]:
         return self._geojson['properties'][key]
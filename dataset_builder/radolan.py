@@ -1,4 +1,5 @@
 import tempfile
+import calendar
 from datetime import datetime as dt
 from datetime import timedelta as td
 
@@ -9,6 +10,7 @@ from wetterdienst.provider.dwd.radar import (
     DwdRadarResolution
 )
 import wradlib as wrl
+import numpy as np
 import rasterio
 from pyproj import CRS, Transformer
 from dateutil.parser import parse
@@ -28,11 +30,99 @@ DEFAULT_REQUEST = dict(
     end_date = NOW,
 )
 
+# default temporal aggregation: disabled
+DEFAULT_AGGREGATION = dict(
+    aggregate=None,
+    aggregate_target='sum',
+    day_start=0,
+    min_coverage=0.0,
+    keep_aggregates=False,
+)
+
+# length of a single input timestep per resolution
+RESOLUTION_STEP = {
+    DwdRadarResolution.HOURLY: td(hours=1),
+    DwdRadarResolution.DAILY: td(days=1),
+}
+
+
+def _period_bounds(timestamp: dt, aggregate: str, day_start: td):
+    """
+    Return the label and the length of the aggregation period the
+    timestamp belongs to. RADOLAN timestamps mark the end of the
+    accumulation interval, thus a timestamp exactly on the boundary
+    is counted to the previous period.
+    """
+    # shift the timestamp so the period boundary falls on midnight
+    shifted = timestamp.replace(tzinfo=None) - day_start - td(microseconds=1)
+
+    if aggregate == 'daily':
+        label = shifted.replace(hour=0, minute=0, second=0, microsecond=0)
+        length = td(days=1)
+    elif aggregate == 'monthly':
+        label = shifted.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        length = td(days=calendar.monthrange(label.year, label.month)[1])
+    else:
+        raise ValueError(f"aggregate has to be one of ['daily', 'monthly'], not '{aggregate}'")
+    
+    return label + day_start, length
+
+
+class _TemporalAccumulator:
+    """
+    Streaming accumulator for the sum, max and count grids of
+    a single aggregation period.
+    """
+    def __init__(self, label: dt, length: td, nodata: float):
+        self.label = label
+        self.length = length
+        self.nodata = nodata
+        self.sum = None
+        self.max = None
+        self.count = None
+        self.meta = None
+        self.n = 0
+    
+    def add(self, grid: np.ndarray, meta: dict) -> None:
+        valid = grid != self.nodata
+        values = np.where(valid, grid, 0.0)
+
+        if self.sum is None:
+            self.sum = values.astype(float)
+            self.max = np.where(valid, grid, -np.inf).astype(float)
+            self.count = valid.astype(int)
+        else:
+            self.sum += values
+            np.maximum(self.max, np.where(valid, grid, -np.inf), out=self.max)
+            self.count += valid
+        
+        # keep the last metadata as template
+        self.meta = meta
+        self.n += 1
+
+    def coverage(self, step: td) -> float:
+        """Fraction of the expected input grids that were added"""
+        return self.n / (self.length / step)
+
+    def result(self, step: td, min_coverage: float) -> dict:
+        # mask all cells that do not meet the completeness threshold
+        expected = self.length / step
+        invalid = (self.count == 0) | (self.count / expected < min_coverage)
+
+        return dict(
+            sum=np.where(invalid, self.nodata, self.sum),
+            max=np.where(invalid, self.nodata, self.max),
+            count=np.where(invalid, self.nodata, self.count.astype(float)),
+        )
+
+
 class RadolanUtility:
     # cache
     _request_cache = DEFAULT_REQUEST
     _request_hash = _h(DEFAULT_REQUEST)
+    _aggregation_cache = DEFAULT_AGGREGATION
     _dataset_cache = []
+    _aggregate_cache = []
     _rasterio_cache = []
     _attribute_cache = []
     _timestamp_cache = []
@@ -43,12 +133,16 @@ class RadolanUtility:
     GRID = wrl.georef.get_radolan_grid(900, 900)
 
     def __init__(self, cache_dir: str = None, **kwargs):
+        # each instance gets its own aggregation settings
+        self._aggregation_cache = DEFAULT_AGGREGATION.copy()
         self._set_request_parameters(**kwargs)
 
         if cache_dir is not None:
             pass
 
     def __getitem__(self, key: str):
+        if key in self._aggregation_cache:
+            return self._aggregation_cache[key]
         return self._request_cache[key]
 
     def __setitem__(self, key: str, value):
@@ -86,11 +180,47 @@ class RadolanUtility:
             else:
                 self._request_cache['end_date'] = parse(kwargs['end_date'])
 
+        # temporal aggregation
+        if 'aggregate' in kwargs:
+            if kwargs['aggregate'] is None:
+                self._aggregation_cache['aggregate'] = None
+            elif kwargs['aggregate'].lower() in ('daily', 'monthly'):
+                self._aggregation_cache['aggregate'] = kwargs['aggregate'].lower()
+            else:
+                raise ValueError(f"aggregate has to be one of [None, 'daily', 'monthly'], not '{kwargs['aggregate']}'")
+        
+        if 'aggregate_target' in kwargs:
+            if kwargs['aggregate_target'] not in ('sum', 'max', 'count'):
+                raise ValueError(f"aggregate_target has to be one of ['sum', 'max', 'count'], not '{kwargs['aggregate_target']}'")
+            self._aggregation_cache['aggregate_target'] = kwargs['aggregate_target']
+        
+        if 'day_start' in kwargs:
+            if isinstance(kwargs['day_start'], td):
+                day_start = kwargs['day_start'].total_seconds() / 3600
+            else:
+                day_start = float(kwargs['day_start'])
+            if not 0 <= day_start < 24:
+                raise ValueError('day_start has to be an hour between 0 and 24')
+            self._aggregation_cache['day_start'] = day_start
+        
+        if 'min_coverage' in kwargs:
+            if not 0 <= kwargs['min_coverage'] <= 1:
+                raise ValueError('min_coverage has to be a fraction between 0 and 1')
+            self._aggregation_cache['min_coverage'] = float(kwargs['min_coverage'])
+        
+        if 'keep_aggregates' in kwargs:
+            self._aggregation_cache['keep_aggregates'] = bool(kwargs['keep_aggregates'])
+
+        # aggregation needs a known input timestep
+        if self._aggregation_cache['aggregate'] is not None and self._request_cache['resolution'] not in RESOLUTION_STEP:
+            raise ValueError(f"Temporal aggregation is not supported for {self._request_cache['resolution']}")
+
         # check if any parameter has changed
-        new_hash = _h(self._request_cache)
+        new_hash = _h({**self._request_cache, **self._aggregation_cache})
         if new_hash != self._request_hash:
             # empty caches
             self._dataset_cache = []
+            self._aggregate_cache = []
             self._timestamp_cache = []
             self._rasterio_cache = []
             self._attribute_cache = []
@@ -103,6 +233,10 @@ class RadolanUtility:
         # build the request
         radolan = DwdRadarValues(**{k: v for k, v in self._request_cache.items()})
 
+        # aggregate on the fly, if requested
+        if self._aggregation_cache['aggregate'] is not None:
+            return self._load_aggregated_data(radolan)
+
         # load data
         for item in radolan.query():
             # load data
@@ -116,6 +250,67 @@ class RadolanUtility:
             self._timestamp_cache.append(meta['datetime'])
             self._attribute_cache.append(meta)
             self._dataset_cache.append(ds)
+    
+    def _load_aggregated_data(self, radolan: DwdRadarValues):
+        """
+        Stream the requested grids into daily or monthly aggregates.
+        Only the grids of the current period are held in memory, the
+        items are expected in chronological order.
+        """
+        aggregate = self._aggregation_cache['aggregate']
+        day_start = td(hours=self._aggregation_cache['day_start'])
+        step = RESOLUTION_STEP[self._request_cache['resolution']]
+
+        acc = None
+        flushed = set()
+        for item in radolan.query():
+            # load data
+            try:
+                ds, meta = wrl.io.read_radolan_composite(item.data)
+            except Exception as e:
+                print(f"Failed at: {item.timestamp}\n{str(e)}")
+                continue
+            
+            # flush the accumulator, if the period is finished
+            label, length = _period_bounds(meta['datetime'], aggregate, day_start)
+            if acc is not None and acc.label != label:
+                self._flush_accumulator(acc, step)
+                flushed.add(acc.label)
+                acc = None
+            
+            if acc is None:
+                # a finished period can't be reopened
+                if label in flushed:
+                    raise ValueError(f"RADOLAN data is not in chronological order: period {label} was already aggregated")
+
+                acc = _TemporalAccumulator(label, length, meta.get('nodataflag', -9999))
+            acc.add(ds, meta)
+        
+        # flush the last period
+        if acc is not None:
+            self._flush_accumulator(acc, step)
+
+    def _flush_accumulator(self, acc: _TemporalAccumulator, step: td) -> None:
+        grids = acc.result(step, self._aggregation_cache['min_coverage'])
+
+        # build the metadata of the aggregated grid. Other than for the raw
+        # RADOLAN grids, the datetime labels the start of the period
+        meta = dict(acc.meta)
+        meta['source_producttype'] = meta.pop('producttype', None)
+        meta['datetime'] = acc.label
+        meta['intervalseconds'] = int(acc.length.total_seconds())
+        meta['aggregate'] = self._aggregation_cache['aggregate']
+        meta['aggregate_target'] = self._aggregation_cache['aggregate_target']
+        meta['coverage'] = acc.coverage(step)
+
+        # save to cache
+        self._timestamp_cache.append(acc.label)
+        self._attribute_cache.append(meta)
+        self._dataset_cache.append(grids[self._aggregation_cache['aggregate_target']])
+
+        # the other grids are only kept on request
+        if self._aggregation_cache['keep_aggregates']:
+            self._aggregate_cache.append(grids)
         
     @property
     def raw_datasets(self):
@@ -131,8 +326,22 @@ class RadolanUtility:
                 self._rasterio_cache.append(self.convert_to_rasterio(ds))
         return self._rasterio_cache
     
+    @property
+    def aggregates(self):
+        """
+        The sum, max and count grids of each aggregation period.
+        Empty, unless temporal aggregation is set with keep_aggregates.
+        """
+        if len(self._dataset_cache) == 0:
+            self._load_data()
+        return self._aggregate_cache
+
     @property
     def timestamps(self):
+        """
+        Timestamps of the datasets. Raw RADOLAN timestamps mark the end
+        of the interval, aggregated ones the start of the period.
+        """
         return self._timestamp_cache
 
     @property
@@ -39,6 +39,10 @@ def spatial_reduce(radolan_chunks: List[np.ma.MaskedArray], targets: List[str] =
     if 'sum' in targets or 'all' in targets:
         data['sum'] = np.fromiter((chunk.sum() for chunk in radolan_chunks), dtype=float)
 
+    # temporally aggregated data reports the share of available input
+    if len(utility.attributes) > 0 and all('coverage' in meta for meta in utility.attributes):
+        data['coverage'] = np.fromiter((meta['coverage'] for meta in utility.attributes), dtype=float)
+
     # create the output dataframe
     df = pd.DataFrame(index=utility.timestamps, data=data)
 
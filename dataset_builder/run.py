@@ -10,6 +10,7 @@ from wetterdienst.provider.dwd import observation, radar
 import pandas as pd
 
 from dataset_builder.ezg import EZG
+from dataset_builder.cache import GeometryCache
 from dataset_builder.radolan import RadolanUtility
 from dataset_builder.reducers.station import transpose_station_data
 
@@ -25,6 +26,7 @@ DEFAULTS = {
     'ezg_dir': pjoin(BASEPATH, 'EZG'),
     'output_dir': pjoin(BASEPATH, 'output_data'),
     'input_dir': pjoin(BASEPATH, 'input_data'),
+    'cache_dir': pjoin(BASEPATH, 'cache'),
     'station_distance': 15,
     'station_closest_n': 1,
     'omit_quality_flag': True,
@@ -36,6 +38,11 @@ DEFAULTS = {
     'radar_resolution': 'DAILY',
     'radar_end_date': 'now',
     'radar_start_date': None,
+    'radar_aggregate': None,                         # 'daily' or 'monthly'
+    'radar_aggregate_target': 'sum',                 # 'sum', 'max' or 'count'
+    'radar_day_start': 0,
+    'radar_min_coverage': 0.0,
+    'radar_keep_aggregates': False,
     'name_property': ['FG_ID', 'LANGNAME'],          # adjust this!
     'if_exists': 'skip',
 }
@@ -115,6 +122,9 @@ def run(**kwargs):
 
     print(f"Found {len(ezgs)} EZG shapes")
 
+    # open the geometry cache
+    cache = GeometryCache(kwargs['cache_dir'])
+
     # build the radolan utility
     utils = []
     for per in kwargs['radar_period']:
@@ -123,7 +133,12 @@ def run(**kwargs):
             period=per,
             resolution=kwargs['radar_resolution'],
             start_date=kwargs['radar_start_date'],
-            end_date=kwargs['radar_end_date']
+            end_date=kwargs['radar_end_date'],
+            aggregate=kwargs['radar_aggregate'],
+            aggregate_target=kwargs['radar_aggregate_target'],
+            day_start=kwargs['radar_day_start'],
+            min_coverage=kwargs['radar_min_coverage'],
+            keep_aggregates=kwargs['radar_keep_aggregates']
         )
         # hot load
         util._load_data()
@@ -151,12 +166,7 @@ def run(**kwargs):
                 EZG._dwd_request_params['period'] = period
 
                 # laod station data
-                if not ezg.get_dwd_within_ezg().df.empty:
-                    stations = ezg.get_dwd_within_ezg()
-                elif not ezg.get_dwd_around_centroid(kwargs['station_distance'], 'km').df.empty:
-                    stations = ezg.get_dwd_around_centroid(kwargs['station_distance'], 'km')
-                else:
-                    stations = ezg.get_dwd_by_rank(kwargs['station_closest_n'])
+                stations = ezg.get_dwd_stations(distance=kwargs['station_distance'], n=kwargs['station_closest_n'], cache=cache)
                 
                 # reduce the data
                 station_data = transpose_station_data(stations, variables='all', omit_quality_flag=kwargs['omit_quality_flag'])
@@ -174,7 +184,7 @@ def run(**kwargs):
         rado_df = pd.DataFrame()
         for util in utils:
             # get the radolan chunks
-            radolan_chunk = ezg.dwd_radolan_load(util=util)
+            radolan_chunk = ezg.dwd_radolan_load(util=util, cache=cache)
             
             # reduce the data
             df = spatial_reduce(radolan_chunk, targets=['sum', 'mean'], utility=util)
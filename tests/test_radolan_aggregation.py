@@ -0,0 +1,82 @@
+from datetime import datetime as dt
+from datetime import timedelta as td
+
+import numpy as np
+import pytest
+
+pytest.importorskip('osgeo')
+from dataset_builder.radolan import _period_bounds, _TemporalAccumulator
+
+
+NODATA = -9999.
+
+
+def test_daily_boundary_with_day_start():
+    # the grid ending exactly on the boundary belongs to the previous day
+    label, length = _period_bounds(dt(2022, 3, 1, 6, 0), 'daily', td(hours=6))
+    assert label == dt(2022, 2, 28, 6, 0)
+    assert length == td(days=1)
+
+    label, _ = _period_bounds(dt(2022, 3, 1, 6, 50), 'daily', td(hours=6))
+    assert label == dt(2022, 3, 1, 6, 0)
+
+    label, _ = _period_bounds(dt(2022, 3, 1, 5, 50), 'daily', td(hours=6))
+    assert label == dt(2022, 2, 28, 6, 0)
+
+
+def test_monthly_boundary_with_day_start():
+    # before the day start on the 1st, the grid still belongs to February
+    label, length = _period_bounds(dt(2022, 3, 1, 5, 50), 'monthly', td(hours=6))
+    assert label == dt(2022, 2, 1, 6, 0)
+    assert length == td(days=28)
+
+    label, length = _period_bounds(dt(2022, 3, 1, 6, 50), 'monthly', td(hours=6))
+    assert label == dt(2022, 3, 1, 6, 0)
+    assert length == td(days=31)
+
+
+def test_unknown_aggregate():
+    with pytest.raises(ValueError):
+        _period_bounds(dt(2022, 3, 1), 'weekly', td(0))
+
+
+def _accumulate(hours: int) -> _TemporalAccumulator:
+    acc = _TemporalAccumulator(dt(2022, 3, 1), td(days=1), NODATA)
+    for i in range(hours):
+        grid = np.array([
+            [1., 2. if i % 2 == 0 else NODATA],
+            [NODATA, float(i)],
+        ])
+        acc.add(grid, dict(nodataflag=NODATA))
+    return acc
+
+
+def test_partial_coverage_is_masked():
+    acc = _accumulate(24)
+    grids = acc.result(td(hours=1), min_coverage=0.8)
+
+    # fully covered cells
+    assert grids['sum'][0, 0] == 24.
+    assert grids['max'][1, 1] == 23.
+    assert grids['count'][0, 0] == 24.
+
+    # the cell covered every second hour is below the threshold
+    assert grids['sum'][0, 1] == NODATA
+    assert grids['max'][0, 1] == NODATA
+    assert grids['count'][0, 1] == NODATA
+
+    # without a threshold, it is kept
+    grids = acc.result(td(hours=1), min_coverage=0.)
+    assert grids['sum'][0, 1] == 24.
+    assert grids['count'][0, 1] == 12.
+
+
+def test_no_valid_input_is_nodata():
+    grids = _accumulate(24).result(td(hours=1), min_coverage=0.)
+    for target in ('sum', 'max', 'count'):
+        assert grids[target][1, 0] == NODATA
+
+
+def test_coverage():
+    assert _accumulate(12).coverage(td(hours=1)) == 0.5
+    assert _accumulate(24).coverage(td(hours=1)) == 1.